@@ -13,18 +13,31 @@ tell the story of test frequency, yield distributions, and geographic spread.
 # Import necessary libraries for the Streamlit application, data manipulation, plotting, and mapping.
 import streamlit as st
 import pandas as pd
+import numpy as np
+import io
+import matplotlib
+# Uses the non-interactive Agg backend, since figures are only ever saved to PNG for Streamlit.
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
 import pydeck as pdk
+import altair as alt
 from datetime import date
 
+# Renders Matplotlib figures at a lower resolution, which is still sharp at the width Streamlit displays them,
+# and simplifies long line paths before drawing them.
+plt.rcParams.update({"figure.dpi": 80, "savefig.dpi": 80, "path.simplify": True, "path.simplify_threshold": 1.0, "agg.path.chunksize": 10000})
+
 # Defines a function to load and preprocess the nuclear explosions data.
 # Uses Streamlit's caching to improve performance by only reloading data if the underlying file changes.
 @st.cache_data
 def load_data():
     # [PY3]
     # Attempts to read the CSV file into a pandas DataFrame.
+    # The pyarrow engine parses the file with multiple threads, which shortens the app's first (uncached) load.
     try:
-        df = pd.read_csv("nuclear_explosions.csv")
+        df = pd.read_csv("nuclear_explosions.csv", engine="pyarrow")
     # Handles the case where the CSV file is not found.
     except FileNotFoundError:
         st.error("Error: nuclear_explosions.csv not found. Please ensure the file is in the correct directory.")
@@ -43,18 +56,175 @@ def load_data():
     "month": df["Date.Month"],
     "day":   df["Date.Day"]
 })
+    # [DA7] Add/create new column ('Year')
+    # Stores the detonation year as a compact integer column so charts and filters don't re-derive it from 'Date'.
+    df["Year"] = df["Date.Year"].astype("int16")
+    # [DA7] Add/create new column ('DateOrd')
+    # Encodes each date as a YYYYMMDD integer (e.g. 19450716) so the date-range filter is a plain integer comparison.
+    df["DateOrd"] = (df["Date.Year"].to_numpy(np.int32) * 10000
+                     + df["Date.Month"].to_numpy(np.int32) * 100
+                     + df["Date.Day"].to_numpy(np.int32))
+    # [DA7] Add/create new column ('Date_str')
+    # Formats every date as an ISO string once, for tooltips; stored as a category since many tests share a date.
+    df["Date_str"] = df["Date"].dt.strftime("%Y-%m-%d").astype("category")
     # Drops the original individual date component columns as they are now combined.
     df.drop(columns=["Date.Year", "Date.Month", "Date.Day"], inplace=True)   # [DA7] Drop columns
     # [DA1] Clean and manipulate data: Renaming columns for clarity
     # Renames latitude and longitude columns for easier use, especially with mapping libraries.
     df.rename(columns={"Location.Cordinates.Latitude": "latitude", "Location.Cordinates.Longitude": "longitude"}, inplace=True)
+    # [DA1] Clean or manipulate data: Converting low-cardinality text columns to the 'category' dtype
+    # Stores each distinct location, supplier, type, purpose, and source once, so .isin() and
+    # value_counts() work on small integer codes instead of comparing strings row by row.
+    # pandas infers the categories already sorted, so the sidebar can use them directly as option lists.
+    for column in ["WEAPON DEPLOYMENT LOCATION", "WEAPON SOURCE COUNTRY", "Data.Type", "Data.Purpose", "Data.Source"]:
+        df[column] = df[column].astype("category")
+    # [DA1] Clean or manipulate data: Downcasting measurement columns to 32-bit floats
+    # Halves the memory every filter pass reads; yields, magnitudes, depths, and coordinates don't need float64 precision.
+    # Any entry that isn't a number becomes NaN instead of stopping the load.
+    for column in ["Data.Yield.Lower", "Data.Yield.Upper", "Data.Magnitude.Body",
+                   "Data.Magnitude.Surface", "Location.Cordinates.Depth", "latitude", "longitude"]:
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("float32")
     # [DA7] Add/create new column ('Yield.Avg')
     # [DA9] Add a new column and perform calculations on DataFrame columns
     # Calculates the average yield from the lower and upper yield estimates and stores it in a new column.
-    df["Yield.Avg"] = (df["Data.Yield.Lower"] + df["Data.Yield.Upper"]) / 2
+    # Works on the float32 arrays directly and halves the sum in place, so only one new array is allocated.
+    yield_avg = df["Data.Yield.Lower"].to_numpy() + df["Data.Yield.Upper"].to_numpy()
+    yield_avg *= np.float32(0.5)
+    df["Yield.Avg"] = yield_avg
     # Returns the processed DataFrame.
     return df
 
+# Defines a function that returns the (min, max) of a numeric column as Python floats, which Streamlit sliders require.
+# Works on the column's raw NumPy array so the two reductions skip pandas' per-call overhead; nanmin/nanmax ignore
+# missing values just like pandas' .min()/.max().
+def column_bounds(series):
+    values = series.to_numpy()
+    return float(np.nanmin(values)), float(np.nanmax(values))
+
+# Defines a function that precomputes the option lists and min/max bounds used by the sidebar filters.
+# Cached so these full-column scans run once instead of on every widget interaction.
+# The leading underscore tells Streamlit not to hash the DataFrame; it comes from the cached load_data() and never changes.
+@st.cache_data
+def compute_filter_metadata(_df):
+    # Computes the numeric slider bounds once each.
+    min_yield, max_yield = column_bounds(_df["Yield.Avg"])
+    min_body, max_body = column_bounds(_df["Data.Magnitude.Body"])
+    min_surface, max_surface = column_bounds(_df["Data.Magnitude.Surface"])
+    min_depth, max_depth = column_bounds(_df["Location.Cordinates.Depth"])
+    # [PY5] Dictionary: returns every sidebar bound and option list in a single dictionary.
+    return {
+        "min_year": int(_df["Year"].min()),
+        "max_year": int(_df["Year"].max()),
+        # [DA2] Sort data (the categorical columns keep their categories pre-sorted, so no re-sorting is needed)
+        "countries": _df["WEAPON DEPLOYMENT LOCATION"].cat.categories.tolist(),
+        "total_countries": len(_df["WEAPON DEPLOYMENT LOCATION"].cat.categories),
+        "suppliers": _df["WEAPON SOURCE COUNTRY"].cat.categories.tolist(),
+        "min_yield": min_yield,
+        "max_yield": max_yield,
+        "min_body": min_body,
+        "max_body": max_body,
+        "min_surface": min_surface,
+        "max_surface": max_surface,
+        "modes": _df["Data.Type"].cat.categories.tolist(),
+        "min_depth": min_depth,
+        "max_depth": max_depth,
+        "purposes": _df["Data.Purpose"].cat.categories.tolist(),
+        # Categories never include NaN, so missing sources are left out automatically.
+        "sources": _df["Data.Source"].cat.categories.tolist()
+    }
+
+# Defines a function that maps each detonation name offered by the lookup selectbox to its row position in the DataFrame.
+# Cached, and uses vectorized string methods, so the name column isn't walked in a Python loop on every rerun,
+# and the chosen detonation is found with a dictionary lookup instead of comparing every name.
+@st.cache_data
+def detonation_name_index(_df):
+    names = _df['Data.Name']
+    # Keeps names that are present and aren't the dataset's 'Nan' placeholder for unnamed tests.
+    is_named = names.notna() & (names.astype('string').str.upper() != "NAN")
+    named = names[is_named]
+    # Keeps the first row for names that appear more than once, in order of first appearance.
+    first = ~named.duplicated()
+    # [PY5] Dictionary: detonation name -> row position
+    return dict(zip(named[first].tolist(), np.flatnonzero(is_named.to_numpy())[first.to_numpy()].tolist()))
+
+# Defines a function that converts a date or timestamp to the same YYYYMMDD integer stored in 'DateOrd'.
+def date_ordinal(day):
+    return day.year * 10000 + day.month * 100 + day.day
+
+# Defines a function that pulls every filterable column out of the DataFrame as a plain NumPy array, once.
+# Cached as a resource so every rerun shares the same arrays instead of re-extracting (or copying) them.
+@st.cache_resource
+def filter_arrays(_df):
+    range_columns = ["DateOrd", "latitude", "Yield.Avg", "Data.Magnitude.Body", "Data.Magnitude.Surface", "Location.Cordinates.Depth"]
+    category_columns = ["WEAPON DEPLOYMENT LOCATION", "WEAPON SOURCE COUNTRY", "Data.Type", "Data.Purpose", "Data.Source"]
+    # [PY5] Dictionary: numeric columns map to their values; categorical columns map to their integer codes and categories.
+    return {
+        "values": {column: _df[column].to_numpy() for column in range_columns},
+        "codes": {column: _df[column].cat.codes.to_numpy() for column in category_columns},
+        "categories": {column: _df[column].cat.categories for column in category_columns}
+    }
+
+# [DA5] Filter data by two or more conditions with AND or OR
+# Defines a function that applies every sidebar filter to the DataFrame and returns the matching rows.
+# The conditions are ANDed into a single boolean mask built from the raw arrays in 'arrays' (see filter_arrays),
+# which skips the DataFrame indexing and temporary Series that chaining pandas .between() calls with & would create.
+# df.query() is deliberately not used: without the optional numexpr package it falls back to evaluating the same
+# chained masks in Python, and it cannot use the cached category codes for the multiselect filters.
+def apply_filters(df, arrays, filters):
+    # [PY5] Dictionary: maps each numeric column to the (low, high) bounds selected in the sidebar.
+    range_filters = {
+        "DateOrd": (date_ordinal(filters["start"]), date_ordinal(filters["end"])),    # Date range filter.
+        "latitude": (filters["lat_low"], filters["lat_high"]),                           # Hemisphere (latitude) filter.
+        "Yield.Avg": (filters["y_low"], filters["y_high"]),                              # Yield range filter.
+        "Data.Magnitude.Body": (filters["body_low"], filters["body_high"]),              # Body wave magnitude filter.
+        "Data.Magnitude.Surface": (filters["surface_low"], filters["surface_high"]),     # Surface wave magnitude filter.
+        "Location.Cordinates.Depth": (filters["d_low"], filters["d_high"])               # Test depth filter.
+    }
+    # Maps each categorical column to the values selected in its multiselect.
+    isin_filters = {
+        "WEAPON DEPLOYMENT LOCATION": filters["countries"],  # Deployment location filter.
+        "WEAPON SOURCE COUNTRY": filters["suppliers"],       # Supplier nation filter.
+        "Data.Type": filters["modes"],                       # Test type filter.
+        "Data.Purpose": filters["purposes"],                 # Purpose filter.
+        "Data.Source": filters["sources"]                    # Data source filter.
+    }
+
+    # Starts with every row selected and narrows the single mask in place, one condition at a time.
+    mask = np.ones(len(df), dtype=bool)
+    # Reuses one scratch buffer for every comparison, so no temporary boolean arrays are allocated.
+    scratch = np.empty(len(df), dtype=bool)
+    for column, (low, high) in range_filters.items():
+        values = arrays["values"][column]
+        np.greater_equal(values, low, out=scratch)
+        mask &= scratch
+        np.less_equal(values, high, out=scratch)
+        mask &= scratch
+    for column, selected in isin_filters.items():
+        categories = arrays["categories"][column]
+        codes = arrays["codes"][column]
+        # When every category is selected (the default), only rows with a missing value (code -1) can fail the check,
+        # so a single comparison replaces the lookup table; like .isin(), it keeps missing values out.
+        if len(set(selected)) == len(categories):
+            np.greater_equal(codes, 0, out=scratch)
+            mask &= scratch
+            continue
+        # Builds a boolean lookup table with one entry per category and gathers it by each row's code,
+        # so each row costs a single array lookup. The extra last entry stays False, so missing values
+        # (code -1) and unknown selections (index -1) never match.
+        lookup = np.zeros(len(categories) + 1, dtype=bool)
+        selected_codes = categories.get_indexer(selected)
+        lookup[selected_codes[selected_codes >= 0]] = True
+        mask &= lookup[codes]
+    # Returns only the rows where every condition holds.
+    return df[mask]
+
+# Defines a function that returns the filtered rows for the current filter state.
+# Cached on the filter signature, so a rerun that leaves the filters alone (e.g. adding a visual or picking a
+# detonation in the lookup) reuses the filtered DataFrame instead of rebuilding the mask.
+@st.cache_data(show_spinner=False, max_entries=64)
+def filtered_detonations(filter_sig, _df, _filters):
+    return apply_filters(_df, filter_arrays(_df), _filters)
+
 # Loads the data using the defined function. This DataFrame will be used throughout the app.
 df = load_data()
 
@@ -91,13 +261,22 @@ def prepare_chart_data(category, visual_id, df, purposes, custom_name="no name")
     elif category == "Map of Filtered Detonations":
         # [MAP] At least one detailed map (PyDeck ScatterplotLayer) with hover text, custom colors
         result["chart_type"] = "pydeck_scatter_detailed"
-        # Selects relevant columns for the map and creates a copy.
-        points_df = df[['latitude', 'longitude', 'Data.Name', 'Date', 'Yield.Avg', 'WEAPON SOURCE COUNTRY']].copy()
-        # [DA1] Clean or manipulate data: Coercing to numeric and filling NA for 'Yield.Avg'
-        # Ensures 'Yield.Avg' is numeric and fills missing values with 0 for map rendering.
-        points_df['Yield.Avg'] = pd.to_numeric(points_df['Yield.Avg'], errors='coerce').fillna(0)
-        # Converts 'Date' column to string format for display in map tooltips.
-        points_df['Date_str'] = points_df['Date'].dt.strftime('%Y-%m-%d')
+        # Builds the map table once from plain column arrays, holding only the fields the layer and tooltip use,
+        # rather than copying a slice of df and then modifying it.
+        # Float32 values are rounded back to float64 so tooltips show 32.54 rather than 32.540000915527344.
+        # Coordinates are rounded to their 3 decimals in the CSV; yields to 4, since each average halves two 3-decimal bounds.
+        points_df = pd.DataFrame({
+            "latitude": df['latitude'].to_numpy(dtype=np.float64).round(3),
+            "longitude": df['longitude'].to_numpy(dtype=np.float64).round(3),
+            "Data.Name": df['Data.Name'].to_numpy(),
+            # Reuses the precomputed ISO date strings for display in map tooltips.
+            "Date_str": df['Date_str'].to_numpy(),
+            # [DA1] Clean or manipulate data: Coercing to numeric and filling NA for 'Yield.Avg'
+            # Ensures 'Yield.Avg' is numeric and fills missing values with 0 for map rendering.
+            "Yield.Avg": pd.to_numeric(df['Yield.Avg'], errors='coerce').fillna(0).to_numpy(dtype=np.float64).round(4),
+            # Keeps the country column categorical, so the renderer can color points from its category codes.
+            "WEAPON SOURCE COUNTRY": df['WEAPON SOURCE COUNTRY'].array
+        })
         # [PY5] Dictionary: Using a dictionary for color mapping
         # Defines a color map for different weapon source countries.
         country_color_map = {
@@ -110,8 +289,17 @@ def prepare_chart_data(category, visual_id, df, purposes, custom_name="no name")
             "PAKIST": [75, 0, 130, 180], # Indigo for PAKISTAN
         }
 
+        # For very large selections, switches to a HexagonLayer that aggregates points into extruded hexagons
+        # on the GPU, instead of asking the browser to draw every detonation as its own marker.
+        # The threshold sits above the full dataset (about 2,000 tests), so the default view stays the detailed map.
+        if len(points_df) > 5000:
+            result.update({
+                "success": True, "chart_type": "pydeck_hexagon", "message": "Data prepared for aggregated PyDeck map.",
+                "data": {"points_df": points_df[['latitude', 'longitude']]},
+                "chart_specific_props": {"radius": 50000, "elevation_scale": 50}
+            })
         # If data points are available, updates the result dictionary with map data and properties.
-        if not points_df.empty:
+        elif not points_df.empty:
             result.update({
                 "success": True, "message": "Data prepared for detailed PyDeck map.",
                 "data": {"points_df": points_df},
@@ -129,12 +317,15 @@ def prepare_chart_data(category, visual_id, df, purposes, custom_name="no name")
         data_values = df['Yield.Avg'].dropna()
         # If data values exist, updates the result dictionary with histogram data and properties.
         if not data_values.empty:
+            # Bins the yields here, in the cached step, so the chart only receives one count per bin.
+            # The bins span the chart's fixed 0-11000 kt axis.
+            counts, edges = np.histogram(data_values.to_numpy(), bins=20, range=(0, 11000))
             result.update({
                 "success": True,
                 "message": "Data prepared for histogram.",
-                "data": {"values": data_values},
+                "data": {"counts": counts, "edges": edges},
                 "labels": {"x_label": "Average Yield (kt)", "y_label": "Number of Detonations"},
-                "chart_specific_props": {"bins": 20, "color": "skyblue", "edgecolor": "black"}
+                "chart_specific_props": {"color": "skyblue", "edgecolor": "black"}
             })
         # If no yield data, sets an appropriate message.
         else:
@@ -144,18 +335,19 @@ def prepare_chart_data(category, visual_id, df, purposes, custom_name="no name")
     elif category == "Timeline: Detonations by Year":
         # [VIZ2] Chart 2: Line plot with title, colors, labels, markers
         result["chart_type"] = "plot"
-        # Extracts the 'Date' column.
-        temp_dates = df['Date']
-        # [DA7] Group columns (effectively, by year then counting)
-        # [DA2] Sort data (by index, which is the year)
-        # Counts the number of detonations per year and sorts by year.
-        detonations_by_year = temp_dates.dt.year.value_counts().sort_index()
+        # Extracts the precomputed 'Year' column as a NumPy array.
+        years = df['Year'].to_numpy()
         # If data exists, updates the result dictionary with timeline data and properties.
-        if not detonations_by_year.empty:
+        if years.size:
+            # [DA7] Group columns (effectively, by year then counting)
+            # [DA2] Sort data (bincount returns the counts already ordered by year, so no sort step is needed)
+            # Counts the number of detonations per year in a single pass, offset from the earliest year.
+            first_year = int(years.min())
+            detonations_by_year = np.bincount(years - first_year)
             result.update({
                 "success": True,
                 "message": "Data prepared for timeline.",
-                "data": {"x_values": detonations_by_year.index, "y_values": detonations_by_year.values},
+                "data": {"x_values": np.arange(first_year, first_year + detonations_by_year.size), "y_values": detonations_by_year},
                 "labels": {"x_label": "Year", "y_label": "Number of Detonations"},
                 "chart_specific_props": {"marker": "o", "linestyle": "-", "color": "green"}
             })
@@ -167,11 +359,14 @@ def prepare_chart_data(category, visual_id, df, purposes, custom_name="no name")
     elif category == "Bar Chart: Detonations by Purpose":
         # [VIZ3] Chart 3: Bar chart with title, colors, labels
         result["chart_type"] = "barh" # Horizontal bar chart
+        # Counts occurrences of each purpose code directly on the categorical codes.
+        purpose_counts = df['Data.Purpose'].value_counts()    # [DA7] Group columns (by purpose then counting)
+        # Drops purposes with no detonations, which categorical value_counts() still lists.
+        purpose_counts = purpose_counts[purpose_counts > 0]
         # [DA1] Manipulate data: Mapping purpose codes to full names
         # [PY5] Dictionary: Accessing 'purposes' dictionary with .get()
-        # Maps purpose codes to their full names using the 'purposes' dictionary, then counts occurrences.
-        purpose_series = df['Data.Purpose'].map(lambda x: purposes.get(x, str(x))).dropna()
-        purpose_counts = purpose_series.value_counts()    # [DA7] Group columns (by purpose then counting)
+        # Renames only the counted purpose codes to their full names instead of mapping every row.
+        purpose_counts = purpose_counts.rename(index=lambda code: purposes.get(code, str(code)))
         # If data exists, updates the result dictionary with bar chart data and properties.
         if not purpose_counts.empty:
             result.update({
@@ -189,15 +384,41 @@ def prepare_chart_data(category, visual_id, df, purposes, custom_name="no name")
     elif category == "Scatter Plot: Yield vs. Depth":
         result["chart_type"] = "scatter"
         # Selects 'Yield.Avg' and 'Location.Cordinates.Depth' columns and drops rows with any NaN values.
-        plot_df = df[['Yield.Avg', 'Location.Cordinates.Depth']].copy().dropna()  # [DA7] Select columns
+        plot_df = df[['Yield.Avg', 'Location.Cordinates.Depth']].dropna()  # [DA7] Select columns
+        # For very large selections, bins the points into a grid so the chart draws one cell per bin
+        # instead of thousands of overlapping markers; the cell color encodes how many tests fall in it.
+        # The threshold sits above the full dataset (about 2,000 tests), so the default view stays a real scatter plot.
+        if len(plot_df) > 5000:
+            depths = plot_df['Location.Cordinates.Depth'].to_numpy()
+            yields = plot_df['Yield.Avg'].to_numpy()
+            # Yields span several orders of magnitude, so their bins are log-spaced; zero yields are counted in the lowest bin.
+            positive_yields = yields[yields > 0]
+            yield_edges = np.geomspace(positive_yields.min(), positive_yields.max(), 51) if positive_yields.size else np.array([0.0, 1.0])
+            yields = np.clip(yields, yield_edges[0], yield_edges[-1])
+            # Depths cluster tightly around zero with a few deep outliers, so the depth bins span the 1st-99th percentile
+            # of the data and the outliers are counted in the outermost bins instead of stretching the axis.
+            depth_low, depth_high = np.percentile(depths, [1, 99])
+            if depth_high <= depth_low:
+                depth_low, depth_high = depth_low - 0.5, depth_high + 0.5
+            depth_edges = np.linspace(depth_low, depth_high, 51)
+            depths = np.clip(depths, depth_low, depth_high)
+            counts, depth_edges, yield_edges = np.histogram2d(depths, yields, bins=[depth_edges, yield_edges])
+            result.update({
+                "success": True,
+                "chart_type": "hist2d",
+                "message": "Data prepared for binned scatter plot.",
+                "data": {"counts": counts, "x_edges": depth_edges, "y_edges": yield_edges},
+                "labels": {"x_label": "Depth (km)", "y_label": "Average Yield (kt)", "color_label": "Number of Detonations"},
+                "chart_specific_props": {"cmap": "viridis", "yscale": "log"}
+            })
         # If enough valid data points exist, updates the result dictionary.
-        if not plot_df.empty and len(plot_df) > 1:
+        elif not plot_df.empty and len(plot_df) > 1:
             result.update({
                 "success": True,
                 "message": "Data prepared for scatter plot.",
                 "data": {"x_values": plot_df['Location.Cordinates.Depth'], "y_values": plot_df['Yield.Avg']},
                 "labels": {"x_label": "Depth (km)", "y_label": "Average Yield (kt)"},
-                "chart_specific_props": {"alpha": 0.6, "edgecolors": "w", "linewidth": 0.5}
+                "chart_specific_props": {"alpha": 0.6, "edgecolors": "white", "linewidth": 0.5}
             })
         # If not enough data, sets an appropriate message.
         else:
@@ -209,6 +430,8 @@ def prepare_chart_data(category, visual_id, df, purposes, custom_name="no name")
         result["chart_type"] = "pie"
         # Counts detonations by 'WEAPON SOURCE COUNTRY'.
         supplier_counts = df['WEAPON SOURCE COUNTRY'].value_counts()  # [DA7] Group columns
+        # Drops suppliers with no detonations, which categorical value_counts() still lists.
+        supplier_counts = supplier_counts[supplier_counts > 0]
         # If data exists, updates the result dictionary with pie chart data and properties.
         if not supplier_counts.empty:
             result.update({
@@ -260,6 +483,345 @@ purpose_map = {
     "Wr/We/S": "Warhead, Weapon & Safety"
 }
 
+# Defines a cached wrapper around prepare_chart_data so an unchanged visual is not re-prepared on every rerun.
+# Streamlit keys the cache on the category, name, and the filter signature tuple, which stands in for the
+# filtered DataFrame; the leading underscore keeps Streamlit from hashing the DataFrame itself.
+# max_entries caps how many prepared visuals stay in memory as users explore different filter combinations.
+@st.cache_data(show_spinner=False, max_entries=64)
+def prepare_chart_data_cached(category, visual_id, custom_name, filter_sig, _filtered_df):
+    return prepare_chart_data(category, visual_id, _filtered_df, purpose_map, custom_name)
+
+# Defines a function that builds the top 10 yields table for the current filters.
+# Cached on the filter signature, so reruns that don't touch the filters (e.g. adding a visual) reuse the finished
+# table instead of repeating the nlargest, formatting, and pivot steps.
+@st.cache_data(show_spinner=False, max_entries=64)
+def build_top_10_table(filter_sig, _filtered_df):
+    # [DA3] Find Top 10 largest values of 'Yield.Avg' column
+    # Gets the top 10 detonations by 'Yield.Avg' from the filtered data.
+    # Use .copy() to avoid potential SettingWithCopyWarning issues later.
+    top_10_df = _filtered_df.nlargest(10, 'Yield.Avg').copy()
+
+    # Returns nothing if no detonations were found for the top 10.
+    if top_10_df.empty:
+        return None
+
+    # Maps purpose codes to full names using 'purpose_map'.
+    # 'Data.Purpose' is categorical, so .map() only translates its categories rather than every row.
+    if 'Data.Purpose' in top_10_df.columns:
+        top_10_df['Purpose.Full'] = top_10_df['Data.Purpose'].map(purpose_map).fillna(top_10_df['Data.Purpose'])
+    else:
+        top_10_df['Purpose.Full'] = "N/A" # Placeholder if 'Data.Purpose' column is missing.
+
+    # Ensures 'Data.Name' is present, provides a fallback if it's missing or all null.
+    if 'Data.Name' not in top_10_df.columns or top_10_df['Data.Name'].isnull().all():
+        top_10_df['Data.Name'] = "Unknown Detonation"
+
+    # Defines columns to be used as the index for the pivot table.
+    # 'Date_str' holds the readable dates precomputed in load_data, so no dates are reformatted here.
+    index_columns = ['Data.Name', 'Date_str', 'WEAPON SOURCE COUNTRY', 'Purpose.Full']
+
+    # [DA6] Analyze data with pivot tables (displaying top 10 detonations)
+    # Runs on only the 10 selected rows, so the pivot costs next to nothing.
+    pivot_top_10_yields = pd.pivot_table(top_10_df,
+                                         index=index_columns,      # Rows of the pivot table.
+                                         values='Yield.Avg',       # Values to aggregate.
+                                         aggfunc='mean',          # Aggregation function (mean, though typically each row is unique here).
+                                         observed=True)           # Only groups present in the data, not every category combination.
+
+    # [DA3] Sort the resulting pivot table by 'Yield.Avg' in descending order for clear presentation
+    # (a stable sort lists tied yields in the pivot's index order).
+    pivot_top_10_yields_sorted = pivot_top_10_yields.sort_values(by='Yield.Avg', ascending=False, kind='stable')
+
+    # Defines new, more readable names for the index levels of the pivot table.
+    new_index_names = {'Data.Name': 'Bomb Name','Date_str': 'Date of Detonation','WEAPON SOURCE COUNTRY': 'Sourced by','Purpose.Full': 'Purpose'}
+    # Renames the index levels.
+    pivot_top_10_yields_sorted.index.rename(new_index_names, inplace = True)
+    # Returns the finished table.
+    return pivot_top_10_yields_sorted
+
+# Defines a function that saves a finished Matplotlib figure as PNG bytes.
+# Crops the excess whitespace around the chart, as st.pyplot does.
+def figure_to_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight") # Resolution comes from the 'savefig.dpi' setting above.
+    return buffer.getvalue()
+
+# The render_*_png functions below draw one chart each and return it as PNG bytes.
+# They are cached on the visual's signature (filters, category, id, and name), which already determines the chart
+# data, so a rerun that leaves a visual unchanged shows its stored image instead of drawing it again.
+# Figures are built with Figure() rather than plt.subplots(), so pyplot never has to track or close them.
+
+# Draws the timeline of detonations per year. [VIZ2]
+@st.cache_data(show_spinner=False, max_entries=64)
+def render_plot_png(chart_sig, _chart_data, _chart_labels, _chart_props):
+    # Unpacks the labels and properties once into local names.
+    x_label, y_label = _chart_labels.get("x_label", ""), _chart_labels.get("y_label", "")
+    marker, linestyle, color = _chart_props.get("marker"), _chart_props.get("linestyle", "-"), _chart_props.get("color")
+    fig = Figure(figsize=(10, 5)) # Creates a Matplotlib figure.
+    ax = fig.add_subplot()
+    # Plots the line chart with specified markers, linestyle, and color.
+    ax.plot(_chart_data["x_values"].astype(str), _chart_data["y_values"], # Converts x_values (years) to string for categorical plotting.
+            marker=marker,
+            linestyle=linestyle,
+            color=color)
+    ax.set_xlabel(x_label) # Sets x-axis label.
+    ax.set_ylabel(y_label) # Sets y-axis label.
+    plt.setp(ax.get_xticklabels(), rotation=45, ha="right") # Rotates x-axis tick labels for better readability.
+    fig.tight_layout()
+    return figure_to_png(fig)
+
+# Draws the horizontal bar chart of detonation purposes. [VIZ3]
+@st.cache_data(show_spinner=False, max_entries=64)
+def render_barh_png(chart_sig, _chart_data, _chart_labels, _chart_props):
+    # Unpacks the labels and properties once into local names.
+    x_label, color = _chart_labels.get("x_label", ""), _chart_props.get("color")
+    y_categories = _chart_data["y_categories"]
+    # Dynamically adjusts figure height based on the number of categories.
+    fig_height = max(2, len(y_categories) * 0.4)
+    fig = Figure(figsize=(10, fig_height))
+    ax = fig.add_subplot()
+    # Plots the horizontal bar chart.
+    ax.barh(y_categories, _chart_data["x_values"],
+            color=color)
+    ax.set_xlabel(x_label) # Sets x-axis label.
+    ax.invert_yaxis() # Inverts y-axis to show the highest bar at the top.
+    fig.tight_layout()
+    return figure_to_png(fig)
+
+# Draws the binned (2D histogram) version of the yield vs. depth scatter plot.
+@st.cache_data(show_spinner=False, max_entries=64)
+def render_hist2d_png(chart_sig, _chart_data, _chart_labels, _chart_props):
+    # Unpacks the labels and properties once into local names.
+    x_label, y_label, color_label = _chart_labels.get("x_label", ""), _chart_labels.get("y_label", ""), _chart_labels.get("color_label", "")
+    cmap, yscale = _chart_props.get("cmap"), _chart_props.get("yscale", "linear")
+    fig = Figure(figsize=(10, 6)) # Creates a Matplotlib figure.
+    ax = fig.add_subplot()
+    # Draws one colored cell per bin; empty bins are masked so they stay blank under the log color scale.
+    mesh = ax.pcolormesh(_chart_data["x_edges"], _chart_data["y_edges"], np.ma.masked_equal(_chart_data["counts"].T, 0),
+                         norm=LogNorm(), cmap=cmap)
+    fig.colorbar(mesh, ax=ax, label=color_label) # Adds a legend for the bin counts.
+    ax.set_xlabel(x_label) # Sets x-axis label.
+    ax.set_ylabel(y_label) # Sets y-axis label.
+    ax.set_yscale(yscale) # Matches the log-spaced yield bins.
+    ax.grid(True, linestyle='--', alpha=0.6) # Adds a grid for better readability.
+    fig.tight_layout()
+    return figure_to_png(fig)
+
+# Draws the pie chart of detonations by supplier nation (WEAPON SOURCE COUNTRY).
+@st.cache_data(show_spinner=False, max_entries=64)
+def render_pie_png(chart_sig, _chart_data, _chart_labels, _chart_props):
+    # Unpacks the properties once into local names.
+    autopct, startangle = _chart_props.get("autopct", "%.1f%%"), _chart_props.get("startangle", 90)
+    sizes = _chart_data["sizes"] # Values for each pie slice.
+    fig = Figure(figsize=(8, 8)) # Creates a Matplotlib figure.
+    ax = fig.add_subplot()
+    # Generates evenly spaced colors from a Matplotlib colormap for the pie chart, one per slice.
+    colors = plt.cm.viridis_r(np.linspace(0, 1, len(sizes), endpoint=False))
+    # Plots the pie chart with specified properties (autopct, startangle, colors).
+    ax.pie(sizes, labels=_chart_data["labels"],
+           autopct=autopct, # Format for percentage display.
+           startangle=startangle, # Start angle for the first slice.
+           colors=colors,
+           wedgeprops={'edgecolor': 'white'}) # Adds white edges to slices.
+    ax.axis('equal')  # Ensures the pie chart is circular.
+    fig.tight_layout()
+    return figure_to_png(fig)
+
+
+# Defines a function that shows a detailed PyDeck scatter plot map.
+def show_scatter_map(chart_sig, chart_data, chart_labels, chart_props):
+    points_data = chart_data.get("points_df")
+    # Normalizes the color map keys once, so each country only needs an exact dictionary lookup.
+    color_map = {str(country).strip().upper(): color for country, color in chart_props.get("color_map").items()}
+
+    # Checks if there is data to plot on the map.
+    if points_data is not None and not points_data.empty:
+        countries = points_data['WEAPON SOURCE COUNTRY'].astype('category')
+        # [PY4] List comprehension to look up each country category's color
+        # Builds a small color table with one entry per country category, plus a trailing empty entry
+        # that code -1 (a missing country) lands on.
+        color_table = np.empty(len(countries.cat.categories) + 1, dtype=object)
+        color_table[:-1] = [color_map.get(str(country).strip().upper()) for country in countries.cat.categories]
+        # Projects the points down to the columns the layer and tooltip read, and adds a 'color' column
+        # with one gather on the category codes instead of a lookup per row. Building a new frame also
+        # leaves the stored chart result untouched for the next rerun.
+        layer_data = points_data[["longitude", "latitude", "Data.Name", "Date_str", "Yield.Avg", "WEAPON SOURCE COUNTRY"]].assign(
+            color=color_table[countries.cat.codes.to_numpy()]
+        )
+        # Defines the ScatterplotLayer for PyDeck.
+        # The points are passed as a DataFrame rather than deck.gl binary attributes: st.pydeck_chart sends
+        # the deck as JSON, which turns NumPy attribute buffers into strings. Payload size is kept down by
+        # sending only the columns the layer and tooltip use, with coordinates rounded in prepare_chart_data.
+        layer = pdk.Layer(
+            "ScatterplotLayer",
+            data=layer_data,
+            get_position=["longitude", "latitude"], # Specifies columns for coordinates.
+            get_fill_color="color",                # Uses the 'color' column for point colors.
+            get_radius= 35000,                     # Sets a fixed radius for points.
+            pickable=True,                         # Allows points to be hovered/clicked.
+            auto_highlight=True                    # Highlights points on hover.
+        )
+        # Defines the tooltip content and style for map interactivity.
+        tooltip = {
+            "html": "<b>Name:</b> {Data.Name}<br/>"
+                    "<b>Date:</b> {Date_str}<br/>"
+                    "<b>Avg Yield (kt):</b> {Yield.Avg}<br/>"
+                    "<b>Supplier:</b> {WEAPON SOURCE COUNTRY}<br/>"
+                    "<i>Lat: {latitude}, Lon: {longitude}</i>",
+            "style": {"backgroundColor": "steelblue", "color": "white"}
+        }
+        # Creates the PyDeck Deck object with the layer, map style, and tooltip.
+        deck = pdk.Deck(
+            layers=[layer],
+            map_style='mapbox://styles/mapbox/dark-v9', # Dark theme map.
+            tooltip=tooltip
+        )
+        # [MAP] is Displayed
+        # Renders the PyDeck chart in Streamlit.
+        st.pydeck_chart(deck, width="stretch")
+    # If no data for the map, displays a caption.
+    else: st.caption("No data available for current filters.")
+
+# Defines a function that shows an aggregated PyDeck hexagon map.
+def show_hexagon_map(chart_sig, chart_data, chart_labels, chart_props):
+    # Unpacks the properties once into local names.
+    radius, elevation_scale = chart_props.get("radius"), chart_props.get("elevation_scale")
+    points_data = chart_data.get("points_df")
+    # Checks if there is data to plot on the map.
+    if points_data is not None and not points_data.empty:
+        # Defines the HexagonLayer; the height and color of each hexagon reflect how many tests fall inside it.
+        layer = pdk.Layer(
+            "HexagonLayer",
+            data=points_data,
+            get_position=["longitude", "latitude"],               # Specifies columns for coordinates.
+            radius=radius,                                         # Hexagon radius in meters.
+            elevation_scale=elevation_scale,                       # Scales hexagon heights.
+            extruded=True,                                         # Draws hexagons as 3D columns.
+            pickable=True,                                         # Allows hexagons to be hovered/clicked.
+            auto_highlight=True                                    # Highlights hexagons on hover.
+        )
+        # Defines the tooltip content and style for map interactivity.
+        tooltip = {
+            "html": "<b>Detonations:</b> {elevationValue}",
+            "style": {"backgroundColor": "steelblue", "color": "white"}
+        }
+        # Creates the PyDeck Deck object, tilted so the hexagon heights are visible.
+        deck = pdk.Deck(
+            layers=[layer],
+            initial_view_state=pdk.ViewState(latitude=0, longitude=0, zoom=1, pitch=40),
+            map_style='mapbox://styles/mapbox/dark-v9', # Dark theme map.
+            tooltip=tooltip
+        )
+        # Renders the PyDeck chart in Streamlit.
+        st.pydeck_chart(deck, width="stretch")
+    # If no data for the map, displays a caption.
+    else: st.caption("No data available for current filters.")
+
+# Defines a function that shows a histogram. [VIZ1]
+def show_histogram(chart_sig, chart_data, chart_labels, chart_props):
+    # Unpacks the labels and properties once into local names.
+    x_label, y_label = chart_labels.get("x_label", ""), chart_labels.get("y_label", "")
+    color, edgecolor = chart_props.get("color", "skyblue"), chart_props.get("edgecolor", "black")
+    counts = chart_data.get("counts")
+    edges = chart_data.get("edges")
+    # Checks if histogram data (binned counts) is available.
+    if counts is not None and edges is not None:
+        # Builds the histogram as an Altair (Vega-Lite) chart, which the browser draws itself,
+        # so no Matplotlib figure has to be rendered on the server.
+        # Draws one bar per precomputed bin, from its left edge to its right edge.
+        hist_chart = alt.Chart(pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "count": counts})).mark_bar(
+            color=color, stroke=edgecolor
+        ).encode(
+            x=alt.X("bin_start:Q", scale=alt.Scale(domain=[0, 11000]), # Sets x-axis limits for yield.
+                    title=x_label),
+            x2="bin_end:Q",
+            y=alt.Y("count:Q", title=y_label)
+        )
+        st.altair_chart(hist_chart, width="stretch")
+    # If no histogram data, displays a caption.
+    else:
+        st.caption("No hist data.")
+
+# Defines a function that shows a line plot (timeline). [VIZ2]
+def show_timeline(chart_sig, chart_data, chart_labels, chart_props):
+    x_values = chart_data.get("x_values")
+    y_values = chart_data.get("y_values")
+    # Checks if x and y values are available and have the same length.
+    if x_values is not None and y_values is not None and len(x_values) == len(y_values):
+        st.image(render_plot_png(chart_sig, chart_data, chart_labels, chart_props), width="stretch")
+    # If no timeline data, displays a caption.
+    else:
+        st.caption("No timeline data.")
+
+# Defines a function that shows a horizontal bar chart. [VIZ3]
+def show_bar_chart(chart_sig, chart_data, chart_labels, chart_props):
+    y_categories = chart_data.get("y_categories")
+    x_values = chart_data.get("x_values")
+    # Checks if categories and values are available and have the same length.
+    if y_categories and x_values and len(y_categories) == len(x_values):
+        st.image(render_barh_png(chart_sig, chart_data, chart_labels, chart_props), width="stretch")
+    # If no bar chart data, displays a caption.
+    else:
+        st.caption("No bar chart data.")
+
+# Defines a function that shows the yield vs. depth scatter plot.
+def show_scatter_plot(chart_sig, chart_data, chart_labels, chart_props):
+    # Unpacks the labels and properties once into local names.
+    x_label, y_label = chart_labels.get("x_label", ""), chart_labels.get("y_label", "")
+    alpha, edgecolors, linewidth = chart_props.get("alpha"), chart_props.get("edgecolors"), chart_props.get("linewidth")
+    x_values = chart_data.get("x_values")
+    y_values = chart_data.get("y_values")
+    # Checks if x and y values are available.
+    if x_values is not None and y_values is not None:
+        # Builds the scatter plot as an Altair (Vega-Lite) chart drawn in the browser.
+        scatter_chart = alt.Chart(pd.DataFrame({"x": x_values.to_numpy(), "y": y_values.to_numpy()})).mark_circle(
+            opacity=alpha,
+            stroke=edgecolors,
+            strokeWidth=linewidth
+        ).encode(
+            x=alt.X("x:Q", title=x_label), # Sets x-axis label.
+            y=alt.Y("y:Q", title=y_label)  # Sets y-axis label.
+        )
+        st.altair_chart(scatter_chart, width="stretch")
+    # If no scatter plot data, displays a caption.
+    else:
+        st.caption("No scatter plot data.")
+
+# Defines a function that shows the binned (2D histogram) yield vs. depth scatter plot.
+def show_binned_scatter_plot(chart_sig, chart_data, chart_labels, chart_props):
+    counts = chart_data.get("counts")
+    # Checks if binned counts are available.
+    if counts is not None:
+        st.image(render_hist2d_png(chart_sig, chart_data, chart_labels, chart_props), width="stretch")
+    # If no binned data, displays a caption.
+    else:
+        st.caption("No scatter plot data.")
+
+# Defines a function that shows the pie chart of detonations by supplier nation.
+def show_pie_chart(chart_sig, chart_data, chart_labels, chart_props):
+    sizes = chart_data.get("sizes") # Values for each pie slice.
+    pie_labels = chart_data.get("labels") # Labels for each pie slice.
+
+    # Checks if sizes and labels are available and have the same length.
+    if sizes and pie_labels and len(sizes) == len(pie_labels):
+        st.image(render_pie_png(chart_sig, chart_data, chart_labels, chart_props), width="stretch")
+    # If no pie chart data, displays a caption.
+    else:
+        st.caption("No data available for pie chart with current filters.")
+
+# [PY5] Dictionary: Maps each chart type produced by prepare_chart_data to the function that shows it,
+# so the render loop looks up its handler directly instead of walking an if/elif chain.
+RENDERERS = {
+    "pydeck_scatter_detailed": show_scatter_map,
+    "pydeck_hexagon": show_hexagon_map,
+    "hist": show_histogram,
+    "plot": show_timeline,
+    "barh": show_bar_chart,
+    "scatter": show_scatter_plot,
+    "hist2d": show_binned_scatter_plot,
+    "pie": show_pie_chart,
+}
+
 
 # [ST4] Customized page design features (sidebar as a major design element)
 # Configures the Streamlit sidebar for user inputs and filters.
@@ -269,8 +831,11 @@ with st.sidebar:
     # Creates an empty placeholder in the sidebar to display the count of filtered detonations later.
     count_placeholder = st.empty()
 
-    # Determines the minimum and maximum years from the 'Date' column for filter ranges.
-    min_year, max_year = int(df["Date"].dt.year.min()), int(df["Date"].dt.year.max())
+    # Loads the cached filter metadata once so each section below reads bounds and options instead of rescanning df.
+    meta = compute_filter_metadata(df)
+
+    # Reads the minimum and maximum years from the cached metadata for filter ranges.
+    min_year, max_year = meta["min_year"], meta["max_year"]
     # Defines the overall minimum and maximum possible dates for date pickers.
     min_date, max_date = date(min_year, 1, 1), date(max_year, 12, 31)
 
@@ -344,8 +909,8 @@ with st.sidebar:
 
     # COUNTRY OF DETONATION FILTER section.
     st.sidebar.header("🗺️ Countries of Detonation")
-    # Calculates the total number of unique deployment locations.
-    total_countries = df["WEAPON DEPLOYMENT LOCATION"].nunique()
+    # Reads the total number of unique deployment locations.
+    total_countries = meta["total_countries"]
     # Creates a placeholder to display the number of selected countries.
     count_slot_country = st.empty()
 
@@ -355,9 +920,9 @@ with st.sidebar:
         # Adds a multiselect widget for choosing deployment locations.
         countries = st.multiselect(
             "", # No extra label needed.
-            # [DA2] Sort data (sorting unique supplier names for the multiselect options)
-            options=sorted(df["WEAPON DEPLOYMENT LOCATION"].unique()), # Options are sorted unique locations.
-            default=sorted(df["WEAPON DEPLOYMENT LOCATION"].unique()),  # All locations selected by default.
+            # [DA2] Sort data (sorted unique locations come precomputed from the cached metadata)
+            options=meta["countries"], # Options are sorted unique locations.
+            default=meta["countries"],  # All locations selected by default.
             key = "country_sel"
         )
     # Updates the placeholder with the count of currently selected countries.
@@ -379,23 +944,23 @@ with st.sidebar:
         suppliers = st.multiselect(
             "", # No extra label.
             #[DA2]
-            options=sorted(df["WEAPON SOURCE COUNTRY"].unique()), # Sorted unique supplier countries.
-            default=sorted(df["WEAPON SOURCE COUNTRY"].unique()),  # All suppliers selected by default.
+            options=meta["suppliers"], # Sorted unique supplier countries.
+            default=meta["suppliers"],  # All suppliers selected by default.
             key="supplier_sel"
         )
     # Displays the number of selected suppliers.
     count_slot_supplier.write(f"✅ {len(suppliers)} selected")
     # Displays the total number of unique suppliers.
-    st.caption(f"🌐 Total suppliers: {df['WEAPON SOURCE COUNTRY'].nunique()}")
+    st.caption(f"🌐 Total suppliers: {len(meta['suppliers'])}")
 
     # Adds spacing.
     st.write("")
 
     # YIELD FILTER section.
     st.sidebar.header("💥 Yield (kt)")
-    # Determines the minimum and maximum average yields from the data.
-    min_yield = float(df["Yield.Avg"].min())
-    max_yield = float(df["Yield.Avg"].max())
+    # Reads the minimum and maximum average yields from the cached metadata.
+    min_yield = meta["min_yield"]
+    max_yield = meta["max_yield"]
 
     # Adds a range slider for filtering by average explosion yield.
     y_low, y_high = st.slider(
@@ -413,10 +978,10 @@ with st.sidebar:
     # SEISMIC MAGNITUDE FILTERS section.
     st.sidebar.header("📈 Seismic Magnitudes")
     st.sidebar.write("Filter by recorded body & surface wave magnitudes:")
-    # Computes the full min/max range for body wave magnitudes.
-    min_body, max_body = float(df["Data.Magnitude.Body"].min()), float(df["Data.Magnitude.Body"].max())
-    # Computes the full min/max range for surface wave magnitudes.
-    min_surface, max_surface = float(df["Data.Magnitude.Surface"].min()), float(df["Data.Magnitude.Surface"].max())
+    # Reads the full min/max range for body wave magnitudes.
+    min_body, max_body = meta["min_body"], meta["max_body"]
+    # Reads the full min/max range for surface wave magnitudes.
+    min_surface, max_surface = meta["min_surface"], meta["max_surface"]
 
     # Uses an expander to group the magnitude sliders.
     with st.sidebar.expander("🔽 Select Magnitude Ranges"):
@@ -441,8 +1006,8 @@ with st.sidebar:
     # TEST Type FILTER section.
     st.sidebar.header("🔧 Test Deployment Type")
     st.write("Filter by deployment types:")
-    # Gets a sorted list of unique deployment types.
-    all_modes = sorted(df["Data.Type"].unique())
+    # Gets the sorted list of unique deployment types.
+    all_modes = meta["modes"]
     # Placeholder for selected types count.
     count_slot_mode = st.empty()
 
@@ -464,8 +1029,8 @@ with st.sidebar:
     st.write("") # Adds spacing.
     st.sidebar.header("📐 Test Depth")
     st.write("Filter by detonation depth (km):")
-    # Computes the full min/max range for test depth.
-    min_depth, max_depth = float(df["Location.Cordinates.Depth"].min()), float(df["Location.Cordinates.Depth"].max())
+    # Reads the full min/max range for test depth.
+    min_depth, max_depth = meta["min_depth"], meta["max_depth"]
 
     # Adds a range slider for test depth.
     d_low, d_high = st.slider(
@@ -481,7 +1046,7 @@ with st.sidebar:
     st.sidebar.header("🎯 Purpose of Detonation")
     st.write("Pick one or more purposes:")
     # Counts the number of unique raw purpose codes.
-    raw_purposes = df["Data.Purpose"].nunique()
+    raw_purposes = len(meta["purposes"])
     # Placeholder for selected purposes count.
     count_slot_purpose = st.empty()
 
@@ -490,8 +1055,8 @@ with st.sidebar:
         # Adds a multiselect for choosing test purposes.
         purposes = st.multiselect(
             "",
-            options=sorted(df["Data.Purpose"].unique()), # Sorted unique purpose codes.
-            default=sorted(df["Data.Purpose"].unique()), # All purposes selected by default.
+            options=meta["purposes"], # Sorted unique purpose codes.
+            default=meta["purposes"], # All purposes selected by default.
             format_func = lambda code: purpose_map.get(code, code), # Displays full names from purpose_map.
             key="purpose_sel"
         )
@@ -506,8 +1071,8 @@ with st.sidebar:
     #DATA SOURCE FILTER section.
     st.sidebar.header("📑 Data Source")
     st.sidebar.write("Filter by reporting agency:")
-    # Gets a sorted list of unique data sources, dropping any NaNs.
-    sources = sorted(df["Data.Source"].dropna().unique())
+    # Gets the sorted list of unique data sources (NaNs already dropped).
+    sources = meta["sources"]
     # Placeholder for selected sources count.
     count_slot_source = st.empty()
 
@@ -525,22 +1090,25 @@ with st.sidebar:
     # Displays the total number of unique data sources.
     st.sidebar.caption(f"🌐 Total sources: {len(sources)}")
 
-# [DA5] Filter data by two or more conditions with AND or OR
-# Applies all selected filters to the main DataFrame to create a 'filtered_df'.
-# Each condition is combined using the logical AND (&) operator.
-filtered_df = df[
-    df["Date"].between(start, end) &                                  # Date range filter.
-    df["latitude"].between(lat_low, lat_high) &                       # Hemisphere (latitude) filter.
-    df["WEAPON DEPLOYMENT LOCATION"].isin(countries) &                # Deployment location filter.
-    df["WEAPON SOURCE COUNTRY"].isin(suppliers) &                     # Supplier nation filter.
-    df["Yield.Avg"].between(y_low, y_high) &                          # Yield range filter.
-    df["Data.Magnitude.Body"].between(body_low, body_high) &          # Body wave magnitude filter.
-    df["Data.Magnitude.Surface"].between(surface_low, surface_high) & # Surface wave magnitude filter.
-    df["Data.Type"].isin(modes) &                                     # Test type filter.
-    df["Location.Cordinates.Depth"].between(d_low, d_high) &          # Test depth filter.
-    df["Data.Purpose"].isin(purposes) &                               # Purpose filter.
-    df["Data.Source"].isin(selected_sources)                          # Data source filter.
-]
+# [PY5] Dictionary: collects every sidebar selection into a single 'filters' dictionary.
+filters = {
+    "start": start, "end": end,
+    "lat_low": lat_low, "lat_high": lat_high,
+    "countries": countries,
+    "suppliers": suppliers,
+    "y_low": y_low, "y_high": y_high,
+    "body_low": body_low, "body_high": body_high,
+    "surface_low": surface_low, "surface_high": surface_high,
+    "modes": modes,
+    "d_low": d_low, "d_high": d_high,
+    "purposes": purposes,
+    "sources": selected_sources
+}
+# Builds a hashable signature of the current filter state; multiselect values are sorted so the
+# order in which options were picked does not matter. Cached helpers use it as their key.
+filter_sig = tuple((key, tuple(sorted(value)) if isinstance(value, list) else value) for key, value in filters.items())
+# Applies all selected filters to the main DataFrame to create a 'filtered_df' (cached per filter state).
+filtered_df = filtered_detonations(filter_sig, df, filters)
 # Updates the placeholder in the sidebar to show the number of detonations after filtering.
 count_placeholder.markdown(f"## 💥 Showing **{len(filtered_df)}** Detonations")
 
@@ -637,6 +1205,14 @@ if submitted:
         st.warning("Please select a visual category before adding.")
         st.toast("Select a visual category first.", icon="👇")
 
+# [PY5] Dictionary: Keeps this session's prepared chart data for the current filter state only.
+# Results are keyed by (category, visual id, name) and the whole dictionary is emptied as soon as the filters change,
+# so unchanged visuals skip data preparation on reruns (e.g. when another visual is added).
+chart_cache = st.session_state.setdefault("chart_cache", {"filter_sig": None, "results": {}})
+if chart_cache["filter_sig"] != filter_sig:
+    chart_cache["filter_sig"] = filter_sig
+    chart_cache["results"] = {}
+
 # Checks if there are any visuals to render, stored in the session state.
 if 'visuals_to_render' in st.session_state and st.session_state.visuals_to_render:
     # Iterates through each visual specification in the list.
@@ -645,15 +1221,23 @@ if 'visuals_to_render' in st.session_state and st.session_state.visuals_to_rende
         current_category = visual_spec["type"]
         user_input_name = visual_spec["user_input_name"]
 
-        # Calling the function that has [PY1] (default param) and [PY2] (returns multiple values
-        # Prepares the data for the current visual using the filtered DataFrame and other relevant info.
-        chart_info = prepare_chart_data(
-            category=current_category,
-            visual_id=current_id,
-            df=filtered_df,          # Passes the currently filtered DataFrame.
-            purposes=purpose_map,    # Passes the purpose mapping dictionary.
-            custom_name=user_input_name # Passes the user-defined name for the visual.
-        )
+        # Collects everything this visual's data depends on; it also keys the cached chart images.
+        chart_sig = (filter_sig, current_category, current_id, user_input_name)
+        # Reuses this session's result for the visual when the filters haven't changed.
+        chart_key = (current_category, current_id, user_input_name)
+        chart_info = chart_cache["results"].get(chart_key)
+        if chart_info is None:
+            # Calling the function that has [PY1] (default param) and [PY2] (returns multiple values
+            # Prepares the data for the current visual, reusing the cached result when the filters have not changed.
+            chart_info = prepare_chart_data_cached(
+                category=current_category,
+                visual_id=current_id,
+                custom_name=user_input_name, # Passes the user-defined name for the visual.
+                filter_sig=filter_sig,       # Identifies the current filter state for the cache.
+                _filtered_df=filtered_df     # Passes the currently filtered DataFrame.
+            )
+            # Stores the result in the session cache for the next rerun.
+            chart_cache["results"][chart_key] = chart_info
         # Creates a container for each visual to group its elements and optionally add a border.
         with st.container(border= True, key=f"container_visual_{current_id}"):
             # Displays the final name of the visual as a subheader.
@@ -665,160 +1249,11 @@ if 'visuals_to_render' in st.session_state and st.session_state.visuals_to_rende
                 chart_data = chart_info.get("data", {})
                 chart_labels = chart_info.get("labels", {})
                 chart_props = chart_info.get("chart_specific_props", {})
-                render_key = f"render_{chart_type}_{current_id}" # Unique key for rendering elements if needed.
-
-                # Renders a detailed PyDeck scatter plot map if the chart type matches.
-                if chart_type == "pydeck_scatter_detailed":
-                    points_data = chart_data.get("points_df")
-                    map_props = chart_info.get("chart_specific_props", {})
-                    color_map = map_props.get("color_map")
-                    # Defines how to get color for each point based on its source country.
-                    def get_color(country):
-                        lookup_key = str(country).strip().upper()
-                        return color_map.get(lookup_key) # Uses the predefined country_color_map.
-
-                    # Checks if there is data to plot on the map.
-                    if points_data is not None and not points_data.empty:
-                        # Applies the color mapping function to create a 'color' column in the points data.
-                        points_data['color'] = points_data['WEAPON SOURCE COUNTRY'].apply(get_color)
-                        # Defines the ScatterplotLayer for PyDeck.
-                        layer = pdk.Layer(
-                            "ScatterplotLayer",
-                            data=points_data,
-                            get_position=["longitude", "latitude"], # Specifies columns for coordinates.
-                            get_fill_color="color",                # Uses the 'color' column for point colors.
-                            get_radius= 35000,                     # Sets a fixed radius for points.
-                            pickable=True,                         # Allows points to be hovered/clicked.
-                            auto_highlight=True                    # Highlights points on hover.
-                        )
-                        # Defines the tooltip content and style for map interactivity.
-                        tooltip = {
-                            "html": "<b>Name:</b> {Data.Name}<br/>"
-                                    "<b>Date:</b> {Date_str}<br/>"
-                                    "<b>Avg Yield (kt):</b> {Yield.Avg}<br/>"
-                                    "<b>Supplier:</b> {WEAPON SOURCE COUNTRY}<br/>"
-                                    "<i>Lat: {latitude}, Lon: {longitude}</i>",
-                            "style": {"backgroundColor": "steelblue", "color": "white"}
-                        }
-                        # Creates the PyDeck Deck object with the layer, map style, and tooltip.
-                        deck = pdk.Deck(
-                            layers=[layer],
-                            map_style='mapbox://styles/mapbox/dark-v9', # Dark theme map.
-                            tooltip=tooltip
-                        )
-                        # [MAP] is Displayed
-                        # Renders the PyDeck chart in Streamlit.
-                        st.pydeck_chart(deck, use_container_width=True)
-                    # If no data for the map, displays a caption.
-                    else: st.caption("No data available for current filters.")
-
-                # Renders a histogram if the chart type matches. [VIZ1]
-                elif chart_type == "hist":
-                    values = chart_data.get("values")
-                    # Checks if histogram data (values) is available.
-                    if values is not None and not values.empty:
-                        fig, ax = plt.subplots(figsize=(10,5)) # Creates a Matplotlib figure and axes.
-                        # Plots the histogram using the provided values and properties.
-                        ax.hist(values, bins=chart_props.get("bins", 20), color=chart_props.get("color", "skyblue"), edgecolor=chart_props.get("edgecolor", "black"))
-                        ax.set_xlabel(chart_labels.get("x_label", "")) # Sets x-axis label.
-                        ax.set_ylabel(chart_labels.get("y_label", "")) # Sets y-axis label.
-                        ax.set_xlim(0, 11000) # Sets x-axis limits for yield.
-                        plt.tight_layout()    # Adjusts plot to prevent labels from overlapping.
-                        st.pyplot(fig)        # Displays the Matplotlib plot in Streamlit.
-                        plt.close(fig)        # Closes the figure to free up memory.
-                    # If no histogram data, displays a caption.
-                    else:
-                        st.caption("No hist data.")
-
-                # Renders a line plot (timeline) if the chart type matches. [VIZ2]
-                elif chart_type == "plot":
-                    x_values = chart_data.get("x_values")
-                    y_values = chart_data.get("y_values")
-                    # Checks if x and y values are available and have the same length.
-                    if x_values is not None and y_values is not None and len(x_values) == len(y_values):
-                        fig, ax = plt.subplots(figsize=(10, 5)) # Creates Matplotlib figure and axes.
-                        # Plots the line chart with specified markers, linestyle, and color.
-                        ax.plot(x_values.astype(str), y_values, # Converts x_values (years) to string for categorical plotting.
-                                marker=chart_props.get("marker"),
-                                linestyle=chart_props.get("linestyle", "-"),
-                                color=chart_props.get("color"))
-                        ax.set_xlabel(chart_labels.get("x_label", "")) # Sets x-axis label.
-                        ax.set_ylabel(chart_labels.get("y_label", "")) # Sets y-axis label.
-                        plt.xticks(rotation=45, ha="right") # Rotates x-axis tick labels for better readability.
-                        plt.tight_layout()
-                        st.pyplot(fig)
-                        plt.close(fig)
-                    # If no timeline data, displays a caption.
-                    else:
-                        st.caption("No timeline data.")
-
-                # Renders a horizontal bar chart if the chart type matches. [VIZ3]
-                elif chart_type == "barh":
-                    y_categories = chart_data.get("y_categories")
-                    x_values = chart_data.get("x_values")
-                    # Checks if categories and values are available and have the same length.
-                    if y_categories and x_values and len(y_categories) == len(x_values):
-                        # Dynamically adjusts figure height based on the number of categories.
-                        fig_height = max(2, len(y_categories) * 0.4)
-                        fig, ax = plt.subplots(figsize=(10, fig_height))
-                        # Plots the horizontal bar chart.
-                        ax.barh(y_categories, x_values,
-                                color=chart_props.get("color"))
-                        ax.set_xlabel(chart_labels.get("x_label", "")) # Sets x-axis label.
-                        ax.invert_yaxis() # Inverts y-axis to show the highest bar at the top.
-                        plt.tight_layout()
-                        st.pyplot(fig)
-                        plt.close(fig)
-                    # If no bar chart data, displays a caption.
-                    else:
-                        st.caption("No bar chart data.")
-
-                # Renders a scatter plot if the chart type matches.
-                elif chart_type == "scatter":
-                    x_values = chart_data.get("x_values")
-                    y_values = chart_data.get("y_values")
-                    # Checks if x and y values are available.
-                    if x_values is not None and y_values is not None:
-                        fig, ax = plt.subplots(figsize=(10, 6)) # Creates Matplotlib figure and axes.
-                        # Plots the scatter chart with specified properties (alpha, edgecolors, linewidth).
-                        ax.scatter(x_values, y_values, alpha=chart_props.get("alpha"),
-                                   edgecolors=chart_props.get("edgecolors"),
-                                   linewidth=chart_props.get("linewidth"))
-                        ax.set_xlabel(chart_labels.get("x_label", "")) # Sets x-axis label.
-                        ax.set_ylabel(chart_labels.get("y_label", "")) # Sets y-axis label.
-                        ax.grid(True, linestyle='--', alpha=0.6) # Adds a grid for better readability.
-                        plt.tight_layout()
-                        st.pyplot(fig)
-                        plt.close(fig)
-                    # If no scatter plot data, displays a caption.
-                    else:
-                        st.caption("No scatter plot data.")
-
-                # Renders a pie chart if the chart type matches.
-                elif chart_type == "pie":
-                    sizes = chart_data.get("sizes") # Values for each pie slice.
-                    pie_labels = chart_data.get("labels") # Labels for each pie slice.
-
-                    # Checks if sizes and labels are available and have the same length.
-                    if sizes and pie_labels and len(sizes) == len(pie_labels):
-                        fig, ax = plt.subplots(figsize=(8, 8)) # Creates Matplotlib figure and axes.
-                                                    # [PY4] List comprehension to generate normalized values for pie chart colors
-                        # Generates a list of colors using a Matplotlib colormap for the pie chart.
-                        colors = plt.cm.viridis_r([i/len(sizes) for i in range(len(sizes))])
-                        # Plots the pie chart with specified properties (autopct, startangle, colors).
-                        ax.pie(sizes, labels=pie_labels,
-                               autopct=chart_props.get("autopct", "%.1f%%"), # Format for percentage display.
-                               startangle=chart_props.get("startangle", 90), # Start angle for the first slice.
-                               colors=colors,
-                               wedgeprops={'edgecolor': 'white'}) # Adds white edges to slices.
-
-                        ax.axis('equal')  # Ensures the pie chart is circular.
-                        plt.tight_layout()
-                        st.pyplot(fig)
-                        plt.close(fig)
-                    # If no pie chart data, displays a caption.
-                    else:
-                        st.caption("No data available for pie chart with current filters.")
+
+                # Looks up the function that shows this chart type and calls it.
+                renderer = RENDERERS.get(chart_type)
+                if renderer is not None:
+                    renderer(chart_sig, chart_data, chart_labels, chart_props)
             # If data preparation failed for any reason, displays the error/failure message.
             else:
                 st.caption(chart_info.get("message", "Could not generate visual."))
@@ -836,21 +1271,14 @@ with st.expander("🔎 Lookup a Detonation by Name"):
         Littleboy, Fatman)  by typing or choosing from the dropdown below 👇.
         """
     )
-    # Prepares a list of valid detonation names for the selectbox.
-    names_col = []
-    for name in df['Data.Name']:
-        if isinstance(name, str) and name.upper() != "NAN": # Includes strings that are not 'NAN'.
-            names_col.append(name)
-        elif pd.notna(name): # Includes other non-null, non-string names if any (e.g., numeric if they exist).
-            names_col.append(name)
+    # Gets the cached index of valid detonation names for the selectbox.
+    name_index = detonation_name_index(df)
 
     # Adds a selectbox for choosing a detonation name.
-    choice = st.selectbox("Type or choose the detonation you want to look into:", names_col)
+    choice = st.selectbox("Type or choose the detonation you want to look into:", list(name_index))
 
-    # Filters the DataFrame to get the row corresponding to the chosen detonation name.
-    choice_df = df.loc[df["Data.Name"] == choice]
-    # Extracts the first row (assuming names are unique or taking the first match).
-    row = choice_df.iloc[0]
+    # Looks up the row of the chosen detonation (the first one, if the name is shared).
+    row = df.iloc[name_index[choice]]
 
     # Extracts various details of the selected detonation from its row.
     choice_sup = row["WEAPON SOURCE COUNTRY"]
@@ -874,10 +1302,11 @@ with st.expander("🔎 Lookup a Detonation by Name"):
     st.write(f"**Location:** 📍 {choice_loc}")
 
     # Displays a simple map showing the location of the selected detonation.
+    # Coordinates are converted to Python floats because st.map cannot JSON-encode NumPy float32 values.
     st.map(
         pd.DataFrame({
-            "latitude": [choice_coord_lat],
-            "longitude": [choice_coord_lon]
+            "latitude": [float(choice_coord_lat)],
+            "longitude": [float(choice_coord_lon)]
         }), height=250
     )
 
@@ -905,56 +1334,21 @@ st.write("""
 
 # Checks if the filtered DataFrame is not empty and contains the 'Yield.Avg' column.
 if not filtered_df.empty and 'Yield.Avg' in filtered_df.columns:
-
-    # [DA3] Find Top 10 largest values of 'Yield.Avg' column
-    # Gets the top 10 detonations by 'Yield.Avg' from the filtered data.
-    # Use .copy() to avoid potential SettingWithCopyWarning issues later.
-    top_10_df = filtered_df.nlargest(10, 'Yield.Avg').copy()
-
-    # Checks if any detonations were found for the top 10.
-    if not top_10_df.empty:
-        # Formats the 'Date' column for better readability.
-        top_10_df['Formatted.Date'] = top_10_df['Date'].dt.strftime('%Y-%m-%d')
-
-        # Maps purpose codes to full names using 'purpose_map'.
-        if 'Data.Purpose' in top_10_df.columns:
-            top_10_df['Purpose.Full'] = top_10_df['Data.Purpose'].map(purpose_map).fillna(top_10_df['Data.Purpose'])
-        else:
-            top_10_df['Purpose.Full'] = "N/A" # Placeholder if 'Data.Purpose' column is missing.
-
-        # Ensures 'Data.Name' is present, provides a fallback if it's missing or all null.
-        if 'Data.Name' not in top_10_df.columns or top_10_df['Data.Name'].isnull().all():
-            top_10_df['Data.Name'] = "Unknown Detonation"
-
-        # Defines columns to be used as the index for the pivot table.
-        index_columns = ['Data.Name', 'Formatted.Date', 'WEAPON SOURCE COUNTRY', 'Purpose.Full']
-
-        # [DA6] Analyze data with pivot tables (displaying top 10 detonations)
-        # Attempts to create a pivot table for the top 10 yields.
-        try:
-            pivot_top_10_yields = pd.pivot_table(top_10_df,
-                                                 index=index_columns,      # Rows of the pivot table.
-                                                 values='Yield.Avg',       # Values to aggregate.
-                                                 aggfunc='mean')          # Aggregation function (mean, though typically each row is unique here).
-
-            # [DA3] Sort the resulting pivot table by 'Yield.Avg' in descending order for clear presentation
-            pivot_top_10_yields_sorted = pivot_top_10_yields.sort_values(by='Yield.Avg', ascending=False)
-
-            # Defines new, more readable names for the index levels of the pivot table.
-            new_index_names = {'Data.Name': 'Bomb Name','Formatted.Date': 'Date of Detonation','WEAPON SOURCE COUNTRY': 'Sourced by','Purpose.Full': 'Purpose'}
-            # Renames the index levels.
-            pivot_top_10_yields_sorted.index.rename(new_index_names, inplace = True)
-
+    # Attempts to build (or reuse the cached) top 10 table for the current filters.
+    try:
+        pivot_top_10_yields_sorted = build_top_10_table(filter_sig, filtered_df)
+        # Checks if any detonations were found for the top 10.
+        if pivot_top_10_yields_sorted is not None:
             # Displays the sorted pivot table as a Streamlit DataFrame.
             st.dataframe(pivot_top_10_yields_sorted)
+        # If no detonations in filtered data to make a top 10 list.
+        else:
+            st.caption("No detonations found in the filtered data to display top 10 yields.")
 
-        # Handles potential errors during pivot table creation.
-        except Exception as e:
-            st.error(f"An error occurred while creating the pivot table for top 10 yields: {e}")
-            st.write("Displaying the top 10 yields as a simple list instead:") # Fallback display.
-    # If no detonations in filtered data to make a top 10 list.
-    else:
-        st.caption("No detonations found in the filtered data to display top 10 yields.")
+    # Handles potential errors during pivot table creation.
+    except Exception as e:
+        st.error(f"An error occurred while creating the pivot table for top 10 yields: {e}")
+        st.write("Displaying the top 10 yields as a simple list instead:") # Fallback display.
 # If filtered data is empty or 'Yield.Avg' is missing.
 else:
     st.caption("Filtered data is empty or 'Yield.Avg' column is missing, cannot determine top 10 yields.")